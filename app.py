@@ -1,8 +1,17 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify, render_template, redirect, url_for, flash
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from pymongo import MongoClient
 from models.team import Team
+from models.fixture import transition_fixture, FixtureConflict, FixtureNotFound
 from utils.db import get_db
+from utils.assets import init_assets
+from utils.logos import init_logos, ingest_logo, logo_url
+from utils.fragment_cache import init_fragment_cache, cached_view, bump_version
+from utils.team_search import TeamSearchIndex
+from utils.queries import (QueryError, STANDINGS_SORT, build_fixtures_query, fixture_team_ids,
+                           serialize_fixture, serialize_standings)
 from datetime import datetime, timedelta
 from config import Config
 from werkzeug.security import check_password_hash
@@ -16,12 +25,28 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+init_assets(app)
+logo_store_dir = init_logos(app)
+logo_images_folder = os.path.join(app.static_folder, 'images')
+# Logos are resized in the background so adding a team never waits on an outbound fetch
+logo_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='logo-ingest')
+
 client = MongoClient(app.config['MONGODB_URI'])
 db = client.get_database()
 teams_collection = db.teams
 fixtures_collection = db.fixtures
 users_collection = db.users
 
+# Version tokens live in Mongo so a write on one worker invalidates every worker's cache
+init_fragment_cache(app, db.cache_versions)
+
+team_index = TeamSearchIndex()
+
+def get_team_index():
+    # Rebuilt on local team writes; the age check catches writes from other workers
+    team_index.refresh_if_stale(teams_collection, app.config['TEAM_INDEX_MAX_AGE'])
+    return team_index
+
 class User(UserMixin):
     def __init__(self, id, username, password):
         self.id = str(id)  # Convert ObjectId to string
@@ -78,6 +103,7 @@ def logout():
 
 @app.route('/admin')
 @login_required
+@cached_view('fixtures', 'teams')
 def admin_dashboard():
     try:
         # Fetch scheduled fixtures
@@ -123,12 +149,52 @@ def add_team():
         logo=data['team_logo']
     )
     try:
-        teams_collection.insert_one(team.to_dict())
-        return jsonify({'message': 'Team added successfully'}), 201
+        result = teams_collection.insert_one(team.to_dict())
     except Exception as e:
         print(f"Error adding team: {e}")
         return jsonify({'message': 'Failed to add team'}), 500
 
+    # The team is stored; failures below are only logged, since reporting them
+    # as a failed insert would make the client retry and create a duplicate
+    try:
+        logo_executor.submit(ingest_team_logo, result.inserted_id, team.logo)
+    except Exception as e:
+        print(f"Error queueing logo ingestion: {e}")
+    try:
+        bump_version('teams')
+    except Exception as e:
+        print(f"Error invalidating cached pages: {e}")
+    try:
+        team_index.refresh(teams_collection)
+    except Exception as e:
+        # The index still catches up on its next reload, within TEAM_INDEX_MAX_AGE
+        print(f"Error refreshing team search index: {e}")
+    return jsonify({'message': 'Team added successfully'}), 201
+
+def process_logo(source):
+    # Fall back to the raw logo if it can't be fetched or decoded
+    try:
+        return ingest_logo(source, logo_store_dir, logo_images_folder)
+    except Exception as e:
+        print(f"Error processing logo {source}: {e}")
+        return None
+
+def ingest_team_logo(team_id, source):
+    logo_id = process_logo(source)
+    if logo_id:
+        # Skip the update if the team's logo was changed in the meantime
+        result = teams_collection.update_one({"_id": team_id, "logo": source}, {"$set": {"logo_id": logo_id}})
+        return result.modified_count > 0
+    return False
+
+@app.cli.command('ingest-logos')
+def ingest_logos_command():
+    """Backfill resized logo variants, e.g. for teams seeded by create_admin.py
+    or whose background ingestion was lost to a restart."""
+    for team in teams_collection.find({"logo_id": None, "logo": {"$nin": [None, ""]}}):
+        if ingest_team_logo(team['_id'], team['logo']):
+            print(f"Processed logo for '{team['name']}'.")
+
 @app.route('/generate-fixtures', methods=['POST'])
 @login_required
 def generate_fixtures_endpoint():
@@ -141,6 +207,7 @@ def generate_fixtures_endpoint():
             for match in round_fixtures:
                 store_fixture(match[0], match[1], match_date)
                 match_date = increment_date(match_date)  # Increment match date as needed
+        bump_version('fixtures')
         return jsonify({'message': 'Fixtures generated successfully'}), 201
     except Exception as e:
         print(f"Error generating fixtures: {e}")
@@ -148,108 +215,101 @@ def generate_fixtures_endpoint():
 
 @app.route('/fixtures', methods=['GET'])
 def get_fixtures():
-    # Get query parameters
-    status = request.args.get('status')
-    from_date = request.args.get('from_date')
-    to_date = request.args.get('to_date')
-    team_id = request.args.get('team_id')
-
-    # Build the query
-    query = {}
-    if status:
-        query['status'] = status
-    if from_date or to_date:
-        query['match_date'] = {}
-        if from_date:
-            try:
-                query['match_date']['$gte'] = datetime.strptime(from_date, '%Y-%m-%d')
-            except ValueError:
-                flash('Invalid from_date format. Use YYYY-MM-DD.', 'error')
-                return redirect(url_for('index'))
-        if to_date:
-            try:
-                query['match_date']['$lte'] = datetime.strptime(to_date, '%Y-%m-%d')
-            except ValueError:
-                flash('Invalid to_date format. Use YYYY-MM-DD.', 'error')
-                return redirect(url_for('index'))
-    if team_id:
-        try:
-            team_oid = ObjectId(team_id)
-            query['$or'] = [
-                {'home_team_id': team_oid},
-                {'away_team_id': team_oid}
-            ]
-        except Exception as e:
-            flash('Invalid team_id.', 'error')
-            return redirect(url_for('index'))
+    try:
+        query = build_fixtures_query(request.args, lambda name: get_team_index().exact_matches(name))
+    except QueryError as e:
+        # JSON like the rest of this endpoint (and async_reads.py), since callers fetch() it
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        # e.g. Mongo failing while the team name index reloads
+        print(f"Error fetching fixtures: {e}")
+        return jsonify({'message': 'Failed to fetch fixtures'}), 500
 
     try:
         # Fetch fixtures based on the query
         fixtures = list(fixtures_collection.find(query))
 
-        # Process fixtures to include team names and format data
-        for fixture in fixtures:
-            home_team = teams_collection.find_one({'_id': ObjectId(fixture['home_team_id'])})
-            away_team = teams_collection.find_one({'_id': ObjectId(fixture['away_team_id'])})
-
-            fixture['home_team_name'] = home_team['name'] if home_team else 'Unknown'
-            fixture['away_team_name'] = away_team['name'] if away_team else 'Unknown'
+        # Fetch all referenced teams in a single query
+        teams = teams_collection.find({'_id': {'$in': fixture_team_ids(fixtures)}}, {'name': 1})
+        team_names = {team['_id']: team['name'] for team in teams}
 
-            # Convert ObjectId to string for JSON serialization
-            fixture['_id'] = str(fixture['_id'])
-            fixture['home_team_id'] = str(fixture['home_team_id'])
-            fixture['away_team_id'] = str(fixture['away_team_id'])
-            # Format date
-            fixture['match_date'] = fixture['match_date'].strftime('%Y-%m-%d')
-
-        return jsonify({'fixtures': fixtures}), 200
+        return jsonify({'fixtures': [serialize_fixture(fixture, team_names) for fixture in fixtures]}), 200
     except Exception as e:
         print(f"Error fetching fixtures: {e}")
         return jsonify({'message': 'Failed to fetch fixtures'}), 500
 
+@app.route('/teams/search', methods=['GET'])
+def search_teams():
+    query = request.args.get('q', '')
+    try:
+        limit = min(int(request.args.get('limit', 10)), 50)
+    except ValueError:
+        limit = 10
+    try:
+        matches = get_team_index().search(query, limit)
+        return jsonify({'teams': [
+            {'team_id': str(team_id), 'name': name} for team_id, name in matches
+        ]}), 200
+    except Exception as e:
+        print(f"Error searching teams: {e}")
+        return jsonify({'message': 'Failed to search teams'}), 500
+
 @app.route('/standings')
 def standings():
     standings_data = get_standings_data()
     return render_template('standings.html', standings=standings_data)
 
+@app.route('/standings/data')
+def standings_data():
+    # The JSON the standings tables fetch; also served by async_reads.py
+    return jsonify({'standings': get_standings_data()}), 200
+
 def get_standings_data():
     try:
-        teams = list(teams_collection.find().sort([
-            ("points", -1),
-            ("goal_difference", -1),
-            ("goals_for", -1)
-        ]))
-        standings = []
-        position = 1
-        for team in teams:
-            standings.append({
-                'Position': position,
-                'TeamLogo': team.get('logo', ''),
-                'TeamName': team.get('name', 'Unknown'),
-                'MatchesPlayed': team.get('matches_played', 0),
-                'Wins': team.get('wins', 0),
-                'Draws': team.get('draws', 0),
-                'Losses': team.get('losses', 0),
-                'GoalsFor': team.get('goals_for', 0),
-                'GoalsAgainst': team.get('goals_against', 0),
-                'GoalDifference': team.get('goal_difference', 0),
-                'Points': team.get('points', 0)
-            })
-            position += 1
-        return standings
+        teams = teams_collection.find().sort(STANDINGS_SORT)
+        return serialize_standings(teams, logo_url)
     except Exception as e:
         print(f"Error getting standings data: {e}")
         return []
 
+class InvalidVersion(ValueError):
+    pass
+
+def get_expected_version():
+    # Optional optimistic-concurrency check: the version the client last saw
+    data = request.get_json(silent=True) or request.form
+    version = data.get('version')
+    if version in (None, ''):
+        return None
+    try:
+        version = int(version)
+    except (TypeError, ValueError):
+        raise InvalidVersion('Invalid version. Use a non-negative integer.')
+    if version < 0:
+        raise InvalidVersion('Invalid version. Use a non-negative integer.')
+    return version
+
+def transition_error_response(error):
+    if isinstance(error, InvalidVersion):
+        return jsonify({'message': str(error)}), 400
+    if isinstance(error, FixtureNotFound):
+        return jsonify({'message': 'Fixture not found'}), 404
+    return jsonify({
+        'message': str(error),
+        'status': error.status,
+        'version': error.version
+    }), 409
+
 @app.route('/approve-game/<fixture_id>', methods=['POST'])
 @login_required
 def approve_game(fixture_id):
     try:
-        fixtures_collection.update_one(
-            {"_id": ObjectId(fixture_id)},
-            {"$set": {"status": "approved"}}
-        )
+        transition_fixture(fixtures_collection, ObjectId(fixture_id), 'approved',
+                           expected_version=get_expected_version())
+        bump_version('fixtures')
         flash('Game approved successfully.', 'success')
+    except (FixtureConflict, FixtureNotFound, InvalidVersion) as e:
+        return transition_error_response(e)
     except Exception as e:
         print(f"Error approving game: {e}")
         flash('Failed to approve game.', 'error')
@@ -257,6 +317,7 @@ def approve_game(fixture_id):
 
 @app.route('/approved-fixtures')
 @login_required
+@cached_view('fixtures', 'teams')
 def approved_fixtures():
     try:
         # Fetch approved fixtures
@@ -298,6 +359,7 @@ def approved_fixtures():
 
 @app.route('/rejected-fixtures')
 @login_required
+@cached_view('fixtures', 'teams')
 def rejected_fixtures():
     try:
         # Fetch rejected fixtures
@@ -346,11 +408,13 @@ def reject_game(fixture_id):
         rejection_reason = request.form.get('rejection_reason', 'No reason provided')
 
         # Update the fixture's status and add the rejection reason
-        fixtures_collection.update_one(
-            {'_id': ObjectId(fixture_id)},
-            {'$set': {'status': 'rejected', 'rejection_reason': rejection_reason}}
-        )
+        transition_fixture(fixtures_collection, ObjectId(fixture_id), 'rejected',
+                           fields={'rejection_reason': rejection_reason},
+                           expected_version=get_expected_version())
+        bump_version('fixtures')
         flash('Fixture rejected successfully.', 'success')
+    except (FixtureConflict, FixtureNotFound, InvalidVersion) as e:
+        return transition_error_response(e)
     except Exception as e:
         print(f"Error rejecting fixture: {e}")
         flash('Failed to reject fixture.', 'error')
@@ -366,19 +430,22 @@ def submit_game():
         away_score = int(data.get('away_score', 0))
         
         try:
-            # Update fixture with submitted results
-            fixtures_collection.update_one(
-                {"_id": ObjectId(fixture_id)},
-                {
-                    "$set": {
-                        "home_score": home_score,
-                        "away_score": away_score,
-                        "status": "pending"
-                    }
-                }
+            # Record the results; only a scheduled fixture can move to pending
+            old, new = transition_fixture(
+                fixtures_collection, ObjectId(fixture_id), 'pending',
+                fields={"home_score": home_score, "away_score": away_score},
+                expected_version=get_expected_version()
             )
+            bump_version('fixtures')
             flash('Game results submitted successfully.', 'success')
-            return jsonify({'message': 'Game results submitted successfully'}), 200
+            return jsonify({
+                'message': 'Game results submitted successfully',
+                'previous_status': old['status'],
+                'status': new['status'],
+                'version': new['version']
+            }), 200
+        except (FixtureConflict, FixtureNotFound, InvalidVersion) as e:
+            return transition_error_response(e)
         except Exception as e:
             print(f"Error submitting game results: {e}")
             flash('Failed to submit game results.', 'error')
@@ -428,7 +495,8 @@ def store_fixture(home_team_id, away_team_id, match_date):
             'home_team_id': home_team_id,
             'away_team_id': away_team_id,
             'match_date': datetime.strptime(match_date, "%Y-%m-%d"),
-            'status': 'scheduled'
+            'status': 'scheduled',
+            'version': 0
         })
     except Exception as e:
         print(f"Error storing fixture: {e}")
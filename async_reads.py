@@ -0,0 +1,124 @@
+# async_reads.py
+# Optional asyncio read tier for the public JSON endpoints (/fixtures and
+# /standings/data). It shares query building and serialization with app.py via
+# utils/queries.py, and returns the same payloads and status codes as the Flask
+# routes, but talks to Mongo through pymongo's asyncio client so a single
+# process can keep thousands of requests in flight.
+#
+# Run it with any ASGI server, e.g.:
+#     uvicorn async_reads:app --port 8001
+# and route the public reads to it.
+import asyncio
+import json
+from urllib.parse import parse_qsl
+
+from pymongo import AsyncMongoClient
+
+from config import Config
+from utils.logos import logo_path
+from utils.queries import (QueryError, STANDINGS_SORT, build_fixtures_query, fixture_team_ids,
+                           serialize_fixture, serialize_standings)
+from utils.team_search import TeamSearchIndex
+
+TEAM_INDEX_MAX_AGE = Config.TEAM_INDEX_MAX_AGE
+
+client = None
+team_index = TeamSearchIndex()
+team_index_lock = asyncio.Lock()
+
+
+def get_db():
+    return client.get_default_database()
+
+
+async def get_team_index():
+    if team_index.is_stale(TEAM_INDEX_MAX_AGE):
+        async with team_index_lock:
+            # Another request may have refreshed it while we waited
+            if team_index.is_stale(TEAM_INDEX_MAX_AGE):
+                teams = await get_db().teams.find({}, {'name': 1}).to_list(None)
+                team_index.load(teams)
+    return team_index
+
+
+async def get_fixtures(args):
+    index = await get_team_index() if args.get('team_id') else team_index
+    try:
+        query = build_fixtures_query(args, index.exact_matches)
+    except QueryError as e:
+        return 400, {'message': str(e)}
+
+    db = get_db()
+    fixtures = await db.fixtures.find(query).to_list(None)
+    teams = await db.teams.find({'_id': {'$in': fixture_team_ids(fixtures)}}, {'name': 1}).to_list(None)
+    team_names = {team['_id']: team['name'] for team in teams}
+    return 200, {'fixtures': [serialize_fixture(fixture, team_names) for fixture in fixtures]}
+
+
+async def get_standings(args):
+    try:
+        teams = await get_db().teams.find().sort(STANDINGS_SORT).to_list(None)
+        standings = serialize_standings(teams, logo_path)
+    except Exception as e:
+        # Same as get_standings_data() in app.py: an empty table rather than an error
+        print(f"Error getting standings data: {e}")
+        standings = []
+    return 200, {'standings': standings}
+
+
+ROUTES = {
+    '/fixtures': get_fixtures,
+    '/standings/data': get_standings,
+}
+
+
+async def send_json(send, status, payload):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def lifespan(receive, send):
+    global client
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Created here so the client binds to the server's event loop
+            client = AsyncMongoClient(Config.MONGODB_URI)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if client is not None:
+                await client.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    handler = ROUTES.get(scope['path'])
+    if handler is None:
+        await send_json(send, 404, {'message': 'Not found'})
+        return
+    if scope['method'] != 'GET':
+        await send_json(send, 405, {'message': 'Method not allowed'})
+        return
+
+    args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+    try:
+        status, payload = await handler(args)
+    except Exception as e:
+        print(f"Error serving {scope['path']}: {e}")
+        status, payload = 500, {'message': f"Failed to fetch {scope['path'].strip('/')}"}
+    await send_json(send, status, payload)
@@ -0,0 +1,117 @@
+# bench_reads.py
+# Load test for the public read endpoints: compares the Flask workers with the
+# asyncio read tier (async_reads.py) under the same concurrency.
+#
+# Example, with both servers running against the same database:
+#     gunicorn -w 4 -b :8000 app:app
+#     uvicorn async_reads:app --port 8001
+#     python bench_reads.py --target sync=http://localhost:8000 \
+#                           --target async=http://localhost:8001 \
+#                           --path /fixtures --path /standings/data -c 1000 -n 20000
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch(reader, writer, host, path):
+    """Send one keep-alive GET; return the status and whether the server closed the connection."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: identity\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = dict(line.split(':', 1) for line in lines[1:] if ':' in line)
+    headers = {name.strip().lower(): value.strip() for name, value in headers.items()}
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        # No length: the server closes the connection after the body
+        await reader.read()
+        return status, True
+    connection = headers.get('connection', '').lower()
+    # HTTP/1.0 servers close after each response unless they say otherwise
+    return status, connection == 'close' or (lines[0].startswith('HTTP/1.0') and connection != 'keep-alive')
+
+
+async def client(url, paths, counter, total, latencies, errors):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    connection = None
+    while True:
+        request_num = counter[0]
+        if request_num >= total:
+            break
+        counter[0] += 1
+        path = paths[request_num % len(paths)]
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(host, port)
+            status, closed = await fetch(*connection, parts.netloc, path)
+            if status != 200:
+                errors.append(status)
+            if closed:
+                connection[1].close()
+                connection = None
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            errors.append(type(e).__name__)
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - started)
+    if connection is not None:
+        connection[1].close()
+
+
+async def run(url, paths, concurrency, total):
+    counter, latencies, errors = [0], [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(url, paths, counter, total, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies), errors
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float('nan')
+
+
+def report(name, elapsed, latencies, errors):
+    print(f"{name}:")
+    print(f"  requests ok    {len(latencies)} ({len(errors)} errors)")
+    print(f"  throughput     {len(latencies) / elapsed:.0f} req/s")
+    if latencies:
+        print(f"  latency mean   {statistics.mean(latencies) * 1000:.1f} ms")
+        for label, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            print(f"  latency {label}    {percentile(latencies, fraction) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare read throughput of the sync and async tiers.")
+    parser.add_argument('--target', action='append', required=True, metavar='NAME=URL',
+                        help="Server to test, e.g. sync=http://localhost:8000 (repeatable)")
+    parser.add_argument('--path', action='append', metavar='PATH',
+                        help="Endpoint to request, cycled per request (default: /fixtures)")
+    parser.add_argument('-c', '--concurrency', type=int, default=200, help="Concurrent connections")
+    parser.add_argument('-n', '--requests', type=int, default=5000, help="Total requests per target")
+    args = parser.parse_args()
+
+    paths = args.path or ['/fixtures']
+    for target in args.target:
+        name, _, url = target.partition('=')
+        elapsed, latencies, errors = asyncio.run(run(url or name, paths, args.concurrency, args.requests))
+        report(name, elapsed, latencies, errors)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,26 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
     MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/football_league")
 
+    # Static assets are copied here under content-hashed names (relative to the app root)
+    ASSETS_BUILD_DIR = os.getenv("ASSETS_BUILD_DIR", "build/assets")
+    # Dynamic JSON/HTML responses smaller than this (in bytes) are sent uncompressed
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
+
+    # Resized team logos, stored under their content id (relative to the app root)
+    LOGO_STORE_DIR = os.getenv("LOGO_STORE_DIR", "media/logos")
+
+    # Rendered HTML fragments kept in memory per worker
+    FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", 256))
+    # Set to a directory (relative to the app root) to share fragments across workers
+    FRAGMENT_CACHE_DIR = os.getenv("FRAGMENT_CACHE_DIR")
+    # Maximum number of fragment files kept in FRAGMENT_CACHE_DIR; oldest are pruned first
+    FRAGMENT_CACHE_DISK_SIZE = int(os.getenv("FRAGMENT_CACHE_DISK_SIZE", 1024))
+
+    # Seconds before a worker reloads its team search index, to pick up teams added elsewhere
+    TEAM_INDEX_MAX_AGE = int(os.getenv("TEAM_INDEX_MAX_AGE", 60))
+
     # Initialize MongoDB client
     client = MongoClient(MONGODB_URI)
     db = client.get_default_database()
@@ -1,12 +1,40 @@
 # models/fixture.py
+from pymongo import ReturnDocument
+
+# Allowed status changes: results are submitted for a scheduled fixture,
+# then reviewed exactly once
+TRANSITIONS = {
+    'scheduled': ('pending',),
+    'pending': ('approved', 'rejected'),
+}
+
+
+class FixtureNotFound(Exception):
+    pass
+
+
+class FixtureConflict(Exception):
+    """The fixture's current state doesn't allow the requested transition."""
+
+    def __init__(self, status, version, new_status):
+        if new_status in TRANSITIONS.get(status, ()):
+            message = f"Fixture was modified by someone else (now at version {version})"
+        else:
+            message = f"Cannot change fixture from '{status}' to '{new_status}'"
+        super().__init__(message)
+        self.status = status
+        self.version = version
+
+
 class Fixture:
-    def __init__(self, home_team_id, away_team_id, match_date, home_score=None, away_score=None, status='scheduled'):
+    def __init__(self, home_team_id, away_team_id, match_date, home_score=None, away_score=None, status='scheduled', version=0):
         self.home_team_id = home_team_id
         self.away_team_id = away_team_id
         self.match_date = match_date
         self.home_score = home_score
         self.away_score = away_score
         self.status = status
+        self.version = version
 
     def to_dict(self):
         return {
@@ -15,5 +43,39 @@ class Fixture:
             'match_date': self.match_date,
             'home_score': self.home_score,
             'away_score': self.away_score,
-            'status': self.status
+            'status': self.status,
+            'version': self.version
         }
+
+
+def transition_fixture(collection, fixture_id, new_status, fields=None, expected_version=None):
+    """Atomically move a fixture to new_status and return its (old, new) documents.
+
+    The status check, the update and the version bump happen in a single
+    find_one_and_update, so two admins acting at once can't both succeed.
+    Pass expected_version to also reject changes based on a stale read.
+    """
+    query = {
+        '_id': fixture_id,
+        'status': {'$in': [status for status, targets in TRANSITIONS.items() if new_status in targets]}
+    }
+    if expected_version is not None:
+        # Fixtures stored before versioning have no version field
+        query['version'] = {'$in': [0, None]} if expected_version == 0 else expected_version
+
+    changes = dict(fields or {}, status=new_status)
+    old = collection.find_one_and_update(
+        query,
+        {'$set': changes, '$inc': {'version': 1}},
+        return_document=ReturnDocument.BEFORE
+    )
+    if old is None:
+        # Only the failure path pays for a second read, to explain what went wrong
+        current = collection.find_one({'_id': fixture_id}, {'status': 1, 'version': 1})
+        if current is None:
+            raise FixtureNotFound(f"Fixture {fixture_id} not found")
+        raise FixtureConflict(current.get('status'), current.get('version', 0), new_status)
+
+    new = dict(old, **changes)
+    new['version'] = old.get('version', 0) + 1
+    return old, new
@@ -1,7 +1,8 @@
 class Team:
-    def __init__(self, name, logo, points=0, matches_played=0, wins=0, draws=0, losses=0, goals_for=0, goals_against=0, goal_diff=0):
+    def __init__(self, name, logo, points=0, matches_played=0, wins=0, draws=0, losses=0, goals_for=0, goals_against=0, goal_diff=0, logo_id=None):
         self.name = name
         self.logo = logo
+        self.logo_id = logo_id  # Content id of the resized variants, see utils/logos.py
         self.points = points
         self.matches_played = matches_played
         self.wins = wins
@@ -32,6 +33,7 @@ class Team:
         return {
             'name': self.name,
             'logo': self.logo,
+            'logo_id': self.logo_id,
             'points': self.points,
             'matches_played': self.matches_played,
             'wins': self.wins,
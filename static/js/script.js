@@ -59,7 +59,7 @@ function loadFixtures() {
 
 // Function to load standings and update the standings table
 function loadStandings() {
-    fetch('/standings')
+    fetch('/standings/data')
         .then(response => response.json())
         .then(data => {
             const tableBody = document.getElementById('standings-table-body');
@@ -67,7 +67,12 @@ function loadStandings() {
             data.standings.forEach(team => {
                 const row = document.createElement('tr');
                 row.innerHTML = `
-                    <td><img src="${team.TeamLogo}" alt="${team.TeamName} Logo" width="50"></td>
+                    <td>
+                        <picture>
+                            ${team.TeamLogoWebp ? `<source srcset="${team.TeamLogoWebp}" type="image/webp">` : ''}
+                            <img src="${team.TeamLogo}" alt="${team.TeamName} Logo" width="50" height="50" loading="lazy">
+                        </picture>
+                    </td>
                     <td>${team.TeamName}</td>
                     <td>${team.Points}</td>
                     <td>${team.Wins}</td>
@@ -0,0 +1,165 @@
+# utils/assets.py
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import time
+
+from flask import abort, request, send_from_directory, url_for
+
+from utils.files import write_atomic
+
+try:
+    import brotli  # Optional: install "Brotli" to also serve .br variants
+except ImportError:
+    brotli = None
+
+# One year; hashed filenames change whenever the content does
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Only text-like formats benefit from compression (images are already compressed)
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.json', '.txt', '.html'}
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/css', 'application/javascript', 'text/plain'}
+
+MANIFEST_NAME = 'manifest.json'
+
+# Builds no longer in the manifest are kept this long (seconds), so clients and
+# workers still on the previous deploy can finish fetching them
+STALE_BUILD_MAX_AGE = 24 * 60 * 60
+
+
+def _hashed_name(path, digest):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:12]}{ext}"
+
+
+def _write_compressed_variants(path, data):
+    write_atomic(path + '.gz', gzip.compress(data, compresslevel=9))
+    if brotli is not None:
+        write_atomic(path + '.br', brotli.compress(data, quality=11))
+
+
+def build_assets(static_folder, build_dir):
+    """Copy every static file to a content-hashed name and precompress text assets.
+
+    Returns a manifest mapping the original relative path to the hashed one.
+    Files whose hashed copy already exists are left alone, so this is cheap to
+    run on every startup.
+    """
+    manifest = {}
+    for dirpath, _, filenames in os.walk(static_folder):
+        for filename in filenames:
+            source = os.path.join(dirpath, filename)
+            relative = os.path.relpath(source, static_folder).replace(os.sep, '/')
+
+            with open(source, 'rb') as f:
+                data = f.read()
+            hashed = _hashed_name(relative, hashlib.sha256(data).hexdigest())
+            manifest[relative] = hashed
+
+            target = os.path.join(build_dir, hashed)
+            if os.path.exists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Variants first: the hashed copy existing is what marks the file as built
+            if os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                _write_compressed_variants(target, data)
+            write_atomic(target, data)
+
+    os.makedirs(build_dir, exist_ok=True)
+    write_atomic(os.path.join(build_dir, MANIFEST_NAME),
+                 json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    _prune_stale_builds(build_dir, manifest)
+    return manifest
+
+
+def _prune_stale_builds(build_dir, manifest):
+    """Remove old hashed files (and their variants) once they've been out of the manifest for a while."""
+    current = {MANIFEST_NAME}
+    for hashed in manifest.values():
+        current.update({hashed, hashed + '.gz', hashed + '.br'})
+    cutoff = time.time() - STALE_BUILD_MAX_AGE
+    for dirpath, _, filenames in os.walk(build_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(path, build_dir).replace(os.sep, '/')
+            try:
+                if relative not in current and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _accepted_encoding(build_dir, filename):
+    """Pick the best precompressed variant the client accepts, if one exists."""
+    encodings = request.accept_encodings
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if encodings[encoding] and os.path.exists(os.path.join(build_dir, filename + suffix)):
+            return encoding, suffix
+    return None, ''
+
+
+def _compress_response(app, response):
+    """Compress large dynamic JSON/HTML bodies on the fly."""
+    if (response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    data = response.get_data()
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    encodings = request.accept_encodings
+    if brotli is not None and encodings['br']:
+        response.set_data(brotli.compress(data, quality=app.config['COMPRESS_BROTLI_QUALITY']))
+        response.headers['Content-Encoding'] = 'br'
+    elif encodings['gzip']:
+        response.set_data(gzip.compress(data, compresslevel=app.config['COMPRESS_LEVEL']))
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_assets(app):
+    """Build fingerprinted assets and register the serving route, template helper and compression hook."""
+    build_dir = os.path.join(app.root_path, app.config['ASSETS_BUILD_DIR'])
+    manifest = build_assets(app.static_folder, build_dir)
+    # Only content-hashed names may be served as immutable (not manifest.json or stale builds)
+    hashed_names = frozenset(manifest.values())
+
+    @app.route('/assets/<path:filename>')
+    def assets(filename):
+        if filename not in hashed_names:
+            abort(404)
+        encoding, suffix = _accepted_encoding(build_dir, filename)
+        # Keep the original type (e.g. text/css) rather than application/gzip
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(build_dir, filename + suffix, mimetype=mimetype,
+                                       download_name=os.path.basename(filename))
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    def asset_url(filename):
+        # Fall back to the plain static route for files added after startup
+        if filename in manifest:
+            return url_for('assets', filename=manifest[filename])
+        return url_for('static', filename=filename)
+
+    app.jinja_env.globals['asset_url'] = asset_url
+
+    @app.after_request
+    def compress_response(response):
+        return _compress_response(app, response)
+
+    return manifest
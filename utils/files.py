@@ -0,0 +1,19 @@
+# utils/files.py
+import os
+import tempfile
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temp file and rename.
+
+    Readers (other workers, or a later run after a crash) see either the old
+    file or the complete new one, never a truncated write.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,210 @@
+# utils/fragment_cache.py
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, request
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from utils.files import write_atomic
+
+
+class FragmentCache:
+    """Bounded LRU of rendered HTML, optionally backed by a directory shared across workers.
+
+    Entries are keyed on the data versions they were rendered from, so writes
+    never delete anything: they bump a namespace version and stale entries
+    simply stop being looked up and age out of the LRU (and of the disk store,
+    which is capped at disk_maxsize files).
+
+    Version tokens must be visible to every worker, so they live in
+    versions_collection (a Mongo collection) when one is given, else in
+    disk_dir. With neither, they are per process and only safe with a single
+    worker.
+    """
+
+    # Prune the disk store every this many writes rather than on each one
+    PRUNE_INTERVAL = 32
+
+    def __init__(self, maxsize=256, disk_dir=None, versions_collection=None, disk_maxsize=None):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self.disk_maxsize = disk_maxsize or maxsize * 4
+        self.versions_collection = versions_collection
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._disk_writes = 0
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(os.path.join(disk_dir, 'fragments'), exist_ok=True)
+            os.makedirs(os.path.join(disk_dir, 'versions'), exist_ok=True)
+
+    def _path(self, kind, name):
+        return os.path.join(self.disk_dir, kind, hashlib.sha1(name.encode('utf-8')).hexdigest())
+
+    def _write_file(self, path, value):
+        write_atomic(path, value.encode('utf-8'))
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if self.disk_dir:
+            try:
+                with open(self._path('fragments', key), encoding='utf-8') as f:
+                    value = f.read()
+            except FileNotFoundError:
+                return None
+            self._remember(key, value)
+            return value
+        return None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self.disk_dir:
+            self._write_file(self._path('fragments', key), value)
+            with self._lock:
+                self._disk_writes += 1
+                prune = self._disk_writes % self.PRUNE_INTERVAL == 0
+            if prune:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        """Drop the oldest fragment files once the store exceeds disk_maxsize."""
+        files = []
+        with os.scandir(os.path.join(self.disk_dir, 'fragments')) as entries:
+            for entry in entries:
+                # Skip other workers' in-flight temp files (cache files are hex digests)
+                if entry.name.startswith('tmp'):
+                    continue
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        if len(files) <= self.disk_maxsize:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.disk_maxsize]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def version(self, *namespaces):
+        """Combined version token for the namespaces, e.g. to key a fragment on."""
+        if self.versions_collection is not None:
+            # One round trip for all namespaces
+            tokens = {doc['_id']: doc['token'] for doc in
+                      self.versions_collection.find({'_id': {'$in': list(namespaces)}})}
+            return '.'.join(tokens.get(namespace, '0') for namespace in namespaces)
+        return '.'.join(self._local_version(namespace) for namespace in namespaces)
+
+    def _local_version(self, namespace):
+        if self.disk_dir:
+            try:
+                with open(self._path('versions', namespace), encoding='utf-8') as f:
+                    return f.read()
+            except FileNotFoundError:
+                return '0'
+        with self._lock:
+            return self._versions.get(namespace, '0')
+
+    def bump(self, *namespaces):
+        # A fresh token rather than a counter, so concurrent bumps from
+        # different workers can't race each other back to an old value
+        token = f"{time.time_ns()}-{os.getpid()}-{threading.get_ident()}"
+        for namespace in namespaces:
+            if self.versions_collection is not None:
+                self.versions_collection.update_one(
+                    {'_id': namespace}, {'$set': {'token': token}}, upsert=True
+                )
+            elif self.disk_dir:
+                self._write_file(self._path('versions', namespace), token)
+            else:
+                with self._lock:
+                    self._versions[namespace] = token
+
+
+class FragmentCacheExtension(Extension):
+    """Adds ``{% cache key, version %}...{% endcache %}`` to templates.
+
+    The version is required (usually ``fragment_version('fixtures', ...)``);
+    without it a fragment would never be invalidated.
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        if not parser.stream.skip_if('comma'):
+            parser.fail("cache block needs a version: {% cache key, version %}", lineno)
+        args.append(parser.parse_expression())
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', args), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, version, caller):
+        cache = self.environment.fragment_cache
+        cache_key = f"fragment:{key}:{version}"
+        html = cache.get(cache_key)
+        if html is None:
+            html = str(caller())
+            cache.set(cache_key, html)
+        return Markup(html)
+
+
+def fragment_version(*namespaces):
+    return current_app.extensions['fragment_cache'].version(*namespaces)
+
+
+def bump_version(*namespaces):
+    """Invalidate every fragment and view rendered from the given namespaces."""
+    current_app.extensions['fragment_cache'].bump(*namespaces)
+
+
+def cached_view(*namespaces):
+    """Cache a view's rendered HTML until one of the namespaces is bumped.
+
+    Only successful renders (plain strings) are cached; redirects and other
+    responses pass straight through.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions['fragment_cache']
+            cache_key = f"view:{request.full_path}:{fragment_version(*namespaces)}"
+            html = cache.get(cache_key)
+            if html is None:
+                html = view(*args, **kwargs)
+                if isinstance(html, str):
+                    cache.set(cache_key, html)
+            return html
+        return wrapper
+    return decorator
+
+
+def init_fragment_cache(app, versions_collection=None):
+    cache_dir = app.config['FRAGMENT_CACHE_DIR']
+    if cache_dir:
+        cache_dir = os.path.join(app.root_path, cache_dir)
+    cache = FragmentCache(app.config['FRAGMENT_CACHE_SIZE'], cache_dir, versions_collection,
+                          app.config['FRAGMENT_CACHE_DISK_SIZE'])
+
+    app.extensions['fragment_cache'] = cache
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.fragment_cache = cache
+    app.jinja_env.globals['fragment_version'] = fragment_version
+    return cache
@@ -0,0 +1,165 @@
+# utils/logos.py
+import hashlib
+import http.client
+import io
+import ipaddress
+import os
+import shutil
+import socket
+import tempfile
+import urllib.request
+
+from flask import abort, send_from_directory, url_for
+from werkzeug.utils import safe_join
+
+from utils.assets import IMMUTABLE_CACHE_CONTROL
+
+try:
+    from PIL import Image  # Optional: install "Pillow" to resize team logos
+except ImportError:
+    Image = None
+
+# Square thumbnails generated for every logo; templates display them at ~50px
+LOGO_SIZES = (32, 64, 128)
+LOGO_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+
+# Refuse to download anything larger than this
+MAX_SOURCE_BYTES = 5 * 1024 * 1024
+
+def _public_sockaddr(host, port):
+    """Resolve host once and return an address that is safe to connect to.
+
+    Every resolved address must be public; the caller connects to the one
+    returned here rather than resolving again, so a DNS answer that changes
+    between the check and the connect (rebinding) can't reach internal hosts.
+    """
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    for _, _, _, _, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0])
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"Refusing to fetch logo from internal address {address} ({host})")
+    return infos[0][4]
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def connect(self):
+        sockaddr = _public_sockaddr(self.host, self.port)
+        self.sock = socket.create_connection(sockaddr[:2], self.timeout, self.source_address)
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        sockaddr = _public_sockaddr(self.host, self.port)
+        sock = socket.create_connection(sockaddr[:2], self.timeout, self.source_address)
+        # Certificate and SNI still use the original host name
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+class _HTTPOnlyRedirectHandler(urllib.request.HTTPRedirectHandler):
+    # Redirect targets connect through the handlers above; other schemes (ftp)
+    # would bypass the address check, so refuse them
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if not newurl.startswith(('http://', 'https://')):
+            raise ValueError(f"Refusing to follow logo redirect to {newurl}")
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+# No proxies: a proxy would resolve the host itself, skipping the check
+_opener = urllib.request.build_opener(
+    urllib.request.ProxyHandler({}), _PublicHTTPHandler, _PublicHTTPSHandler, _HTTPOnlyRedirectHandler
+)
+
+
+def _read_source(source, images_folder):
+    """Fetch the original logo bytes from a public URL or a file under static/images."""
+    if source.startswith(('http://', 'https://')):
+        with _opener.open(source, timeout=10) as response:
+            data = response.read(MAX_SOURCE_BYTES + 1)
+    else:
+        path = safe_join(images_folder, os.path.basename(source))
+        if path is None or not os.path.isfile(path):
+            raise FileNotFoundError(f"Logo file not found: {source}")
+        with open(path, 'rb') as f:
+            data = f.read(MAX_SOURCE_BYTES + 1)
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ValueError(f"Logo is larger than {MAX_SOURCE_BYTES} bytes: {source}")
+    return data
+
+
+def _square_thumbnail(image, size, background):
+    """Shrink the image to fit a size x size square without cropping."""
+    thumb = image.copy()
+    thumb.thumbnail((size, size), Image.LANCZOS)
+    canvas = Image.new('RGBA', (size, size), background)
+    canvas.paste(thumb, ((size - thumb.width) // 2, (size - thumb.height) // 2), thumb)
+    return canvas
+
+
+def ingest_logo(source, store_dir, images_folder):
+    """Store resized WebP/JPEG variants of a logo and return its content id.
+
+    The id is derived from the source bytes, so ingesting the same logo twice
+    reuses the existing variants.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is required to process team logos")
+
+    data = _read_source(source, images_folder)
+    logo_id = hashlib.sha256(data).hexdigest()[:16]
+    logo_dir = os.path.join(store_dir, logo_id)
+    if os.path.isdir(logo_dir):
+        return logo_id
+
+    image = Image.open(io.BytesIO(data)).convert('RGBA')
+    tmp_dir = tempfile.mkdtemp(dir=store_dir)
+    for size in LOGO_SIZES:
+        # WebP keeps transparency; JPEG has none, so flatten onto white
+        webp = _square_thumbnail(image, size, (255, 255, 255, 0))
+        webp.save(os.path.join(tmp_dir, f"{size}.webp"), 'WEBP', quality=80, method=6)
+        jpeg = _square_thumbnail(image, size, (255, 255, 255, 255)).convert('RGB')
+        jpeg.save(os.path.join(tmp_dir, f"{size}.jpg"), 'JPEG', quality=85, optimize=True, progressive=True)
+    # Publish all variants at once so readers never see a half-written directory
+    try:
+        os.replace(tmp_dir, logo_dir)
+    except OSError:
+        # Another worker ingested the same logo first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return logo_id
+
+
+def logo_url(logo_id, size=64, ext='jpg'):
+    return url_for('team_logo', logo_id=logo_id, size=size, ext=ext)
+
+
+def logo_path(logo_id, size=64, ext='jpg'):
+    # Same URL as logo_url, for code running outside a Flask request (async_reads.py)
+    return f"/logos/{logo_id}/{size}.{ext}"
+
+
+def init_logos(app):
+    """Register the route serving processed logos and the logo_url template helper."""
+    store_dir = os.path.join(app.root_path, app.config['LOGO_STORE_DIR'])
+    os.makedirs(store_dir, exist_ok=True)
+
+    @app.route('/logos/<logo_id>/<int:size>.<ext>')
+    def team_logo(logo_id, size, ext):
+        if size not in LOGO_SIZES or ext not in LOGO_FORMATS:
+            abort(404)
+        # Paths are content-addressed, so the path itself is a strong ETag
+        response = send_from_directory(store_dir, f"{logo_id}/{size}.{ext}",
+                                       etag=f"{logo_id}-{size}-{ext}")
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    app.jinja_env.globals['logo_url'] = logo_url
+    return store_dir
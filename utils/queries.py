@@ -0,0 +1,104 @@
+# utils/queries.py
+# Query building and serialization for the public read endpoints, shared by
+# the Flask routes in app.py and the asyncio read tier in async_reads.py.
+from datetime import datetime
+
+from bson.objectid import ObjectId
+
+STANDINGS_SORT = [
+    ("points", -1),
+    ("goal_difference", -1),
+    ("goals_for", -1)
+]
+
+
+class QueryError(ValueError):
+    """A request parameter couldn't be turned into a query."""
+
+
+def build_fixtures_query(args, resolve_team):
+    """Build the Mongo filter for /fixtures from its query parameters.
+
+    resolve_team maps a team name to the ids of teams with exactly that
+    (normalized) name, so callers can plug in their own TeamSearchIndex.
+    """
+    status = args.get('status')
+    from_date = args.get('from_date')
+    to_date = args.get('to_date')
+    team_id = args.get('team_id')
+
+    query = {}
+    if status:
+        query['status'] = status
+    if from_date or to_date:
+        query['match_date'] = {}
+        if from_date:
+            try:
+                query['match_date']['$gte'] = datetime.strptime(from_date, '%Y-%m-%d')
+            except ValueError:
+                raise QueryError('Invalid from_date format. Use YYYY-MM-DD.')
+        if to_date:
+            try:
+                query['match_date']['$lte'] = datetime.strptime(to_date, '%Y-%m-%d')
+            except ValueError:
+                raise QueryError('Invalid to_date format. Use YYYY-MM-DD.')
+    if team_id:
+        # Accept an exact team name as well as an id; never guess between teams
+        if ObjectId.is_valid(team_id):
+            team_oid = ObjectId(team_id)
+        else:
+            matches = resolve_team(team_id)
+            if not matches:
+                raise QueryError('Invalid team_id.')
+            if len(matches) > 1:
+                raise QueryError('Ambiguous team name.')
+            team_oid = matches[0]
+        query['$or'] = [
+            {'home_team_id': team_oid},
+            {'away_team_id': team_oid}
+        ]
+    return query
+
+
+def fixture_team_ids(fixtures):
+    """Unique team ids referenced by the fixtures, for a single $in lookup."""
+    team_ids = set()
+    for fixture in fixtures:
+        team_ids.add(fixture['home_team_id'])
+        team_ids.add(fixture['away_team_id'])
+    return list(team_ids)
+
+
+def serialize_fixture(fixture, team_names):
+    """Add team names and convert ObjectIds/dates so the fixture is JSON-safe."""
+    fixture = dict(fixture)
+    fixture['home_team_name'] = team_names.get(fixture['home_team_id'], 'Unknown')
+    fixture['away_team_name'] = team_names.get(fixture['away_team_id'], 'Unknown')
+
+    fixture['_id'] = str(fixture['_id'])
+    fixture['home_team_id'] = str(fixture['home_team_id'])
+    fixture['away_team_id'] = str(fixture['away_team_id'])
+    fixture['match_date'] = fixture['match_date'].strftime('%Y-%m-%d')
+    return fixture
+
+
+def serialize_standings(teams, logo_url):
+    """Turn teams (already sorted by STANDINGS_SORT) into standings rows."""
+    standings = []
+    for position, team in enumerate(teams, start=1):
+        logo_id = team.get('logo_id')
+        standings.append({
+            'Position': position,
+            'TeamLogo': logo_url(logo_id, 64, 'jpg') if logo_id else team.get('logo', ''),
+            'TeamLogoWebp': logo_url(logo_id, 64, 'webp') if logo_id else '',
+            'TeamName': team.get('name', 'Unknown'),
+            'MatchesPlayed': team.get('matches_played', 0),
+            'Wins': team.get('wins', 0),
+            'Draws': team.get('draws', 0),
+            'Losses': team.get('losses', 0),
+            'GoalsFor': team.get('goals_for', 0),
+            'GoalsAgainst': team.get('goals_against', 0),
+            'GoalDifference': team.get('goal_difference', 0),
+            'Points': team.get('points', 0)
+        })
+    return standings
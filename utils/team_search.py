@@ -0,0 +1,114 @@
+# utils/team_search.py
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and collapse punctuation/whitespace to single spaces."""
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', stripped.casefold()).split())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Snapshot:
+    """Immutable lookup structures, swapped in whole so readers never see a partial rebuild."""
+
+    def __init__(self, teams):
+        self.names = {}
+        self.normalized = {}
+        self.by_normalized = {}
+        prefixes = []
+        self.trigrams = {}
+        for team in teams:
+            team_id = team['_id']
+            name = team.get('name', '')
+            normalized = normalize_name(name)
+            if not normalized:
+                continue
+            self.names[team_id] = name
+            self.normalized[team_id] = normalized
+            self.by_normalized.setdefault(normalized, []).append(team_id)
+            # Index the full name and every word suffix, so "wand" finds "Lusaka Wanderers"
+            words = normalized.split(' ')
+            for i in range(len(words)):
+                prefixes.append((' '.join(words[i:]), 0 if i == 0 else 1, team_id))
+            for gram in _trigrams(normalized):
+                self.trigrams.setdefault(gram, set()).add(team_id)
+        prefixes.sort(key=lambda entry: entry[0])
+        self.prefix_keys = [entry[0] for entry in prefixes]
+        self.prefix_entries = prefixes
+
+
+class TeamSearchIndex:
+    """In-process prefix/trigram index over team names for autocomplete."""
+
+    def __init__(self):
+        self._snapshot = _Snapshot([])
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def load(self, teams):
+        self._snapshot = _Snapshot(teams)
+        self._loaded_at = time.monotonic()
+
+    def refresh(self, collection):
+        with self._lock:
+            self.load(collection.find({}, {'name': 1}))
+
+    def refresh_if_stale(self, collection, max_age):
+        if self.is_stale(max_age):
+            with self._lock:
+                # Another thread may have rebuilt it while we waited for the lock
+                if self.is_stale(max_age):
+                    self.load(collection.find({}, {'name': 1}))
+
+    def is_stale(self, max_age):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > max_age
+
+    def search(self, query, limit=10, fuzzy=True):
+        """Return up to limit (team_id, name) pairs, best matches first.
+
+        Exact names rank first, then name prefixes, then word prefixes. With
+        fuzzy, trigram overlap fills in the rest so small typos still match.
+        """
+        snapshot = self._snapshot
+        normalized = normalize_name(query)
+        if not normalized or limit <= 0:
+            return []
+
+        ranked = {}
+        position = bisect.bisect_left(snapshot.prefix_keys, normalized)
+        while position < len(snapshot.prefix_keys) and snapshot.prefix_keys[position].startswith(normalized):
+            _, rank, team_id = snapshot.prefix_entries[position]
+            position += 1
+            if snapshot.normalized[team_id] == normalized:
+                rank = -1
+            if rank < ranked.get(team_id, (2,))[0]:
+                ranked[team_id] = (rank, 0)
+
+        if fuzzy and len(ranked) < limit:
+            query_grams = _trigrams(normalized)
+            overlap = {}
+            for gram in query_grams:
+                for team_id in snapshot.trigrams.get(gram, ()):
+                    overlap[team_id] = overlap.get(team_id, 0) + 1
+            for team_id, shared in overlap.items():
+                # Require at least half of the query's trigrams to match
+                if team_id not in ranked and shared * 2 >= len(query_grams):
+                    ranked[team_id] = (2, -shared)
+
+        best = heapq.nsmallest(limit, ranked, key=lambda team_id: (ranked[team_id], snapshot.normalized[team_id]))
+        return [(team_id, snapshot.names[team_id]) for team_id in best]
+
+    def exact_matches(self, name):
+        """Return the ids of every team whose normalized name equals name's."""
+        return list(self._snapshot.by_normalized.get(normalize_name(name), ()))